@@ -17,12 +17,26 @@ from .safe_rsync import (
     check_platform,
     parse_rsync_version,
     check_rsync,
+    rsync_supports,
     abspath,
+    resolved_dir,
+    is_empty_dir,
+    default_block_size,
+    tuning_options,
     build_rsync_command,
     print_rsync_header,
     execute_rsync,
+    merge_stats,
+    shard_entries,
+    execute_rsync_sharded,
+    list_unchanged_files,
+    execute_checksum_pass,
     save_summary,
     print_summary,
+    print_completion,
     run_rsync,
+    read_pairs,
+    sync_pair,
+    run_many,
     main
 )
@@ -9,16 +9,24 @@ Features:
 - Log file summary
 """
 
+# platform, shutil, tempfile, json and concurrent.futures are imported where they are used;
+# together they make up a good part of the start-up time, and most runs need at most some of them.
 import argparse
-import datetime
+import contextlib
+import fnmatch
+import functools
+import heapq
+import io
 import os
-import platform
+import queue
 import re
-import shutil
+import shlex
+import stat
 import subprocess
 import sys
+import threading
 import time
-from typing import NoReturn, Tuple
+from typing import Callable, Iterator, NoReturn, Optional, Sequence, Tuple, Union
 
 # ──────────────────────────────────────────────────────────────────────────────
 # ANSI colours
@@ -29,6 +37,10 @@ RED = "\033[1;31m"  # bright/bold red
 ORANGE = "\033[1;33m"  # bright/bold orange
 RESET = "\033[0m"  # reset style/colour
 
+# No escape codes when stdout is piped (cron logs, grep) or NO_COLOR is set (https://no-color.org).
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    GREEN = CYAN = RED = ORANGE = RESET = ""
+
 
 def colorprint(color: str, msg: str, **kwargs) -> None:
     """Print a message in the specified ANSI color and reset the style afterwards.
@@ -53,10 +65,17 @@ def abort(msg: str, code: int = 1) -> NoReturn:
 
 def check_platform() -> None:
     """Ensure the script is not run on unsupported platforms like Windows."""
+    import platform
+
     if platform.system() == "Windows":
         abort("This script supports only macOS and Linux.")
 
 
+# Anchored to the start of the output, with a bounded version part, so a miss fails fast.
+# Any line: openrsync (macOS) prints "openrsync: protocol version 29" first, then "rsync version 2.6.9 compatible".
+_VERSION_RE = re.compile(r"^rsync[ \t]+version[ \t]+v?(\d+(?:\.\d+){1,2})", re.MULTILINE)
+
+
 def parse_rsync_version(output: str) -> Tuple[str, Tuple[int, int, int]]:
     """Parse the rsync version from `rsync --version` output.
 
@@ -66,45 +85,250 @@ def parse_rsync_version(output: str) -> Tuple[str, Tuple[int, int, int]]:
     Returns:
         A tuple: (version string, (major, minor, patch) tuple).
     """
-    match = re.search(r"rsync\s+version\s+([0-9]+(?:\.[0-9]+)+)", output)
-    if not match:
-        raise RuntimeError("Couldn't detect rsync version.")
+    # Fast path for the usual first line, "rsync  version [v]X.Y.Z  protocol version NN".
+    tokens = output.partition("\n")[0].split(maxsplit=3)
+    fields = tokens[2].removeprefix("v").split(".") if len(tokens) > 2 and tokens[:2] == ["rsync", "version"] else []
+    if 2 <= len(fields) <= 3 and all(f.isdecimal() for f in fields):
+        version_str = tokens[2].removeprefix("v")
+    else:
+        match = _VERSION_RE.search(output)
+        if not match:
+            raise RuntimeError("Couldn't detect rsync version.")
+        version_str = match.group(1)
+
+    parts = (*map(int, version_str.split(".")), 0, 0)[:3]
+    return version_str, parts  # type: ignore[return-value]
+
+
+@functools.cache
+def _rsync_bin() -> str:
+    """Return the full path of the rsync executable, looked up in $PATH once per process."""
+    import shutil
+
+    rsync_bin = shutil.which("rsync")
+    if rsync_bin is None:
+        abort("rsync not found in $PATH.")
+    return rsync_bin
+
+
+def _cache_dir() -> str:
+    """Return the per-user cache directory of safe_rsync (XDG on Linux, ~/Library/Caches on macOS)."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = "~/Library/Caches" if sys.platform == "darwin" else "~/.cache"
+    return os.path.join(os.path.expanduser(base), "safe_rsync")
+
+
+@functools.lru_cache(maxsize=None)
+def _rsync_version(rsync_bin: str) -> Tuple[str, Tuple[int, int, int]]:
+    """Detect the version of the given rsync binary.
+
+    The result is persisted as JSON in `_cache_dir()`, keyed by the binary's
+    path, mtime and size, so `rsync --version` only has to run again after
+    rsync has been replaced or upgraded.
+
+    Args:
+        rsync_bin: Full path of the rsync executable.
+
+    Returns:
+        The same tuple as `parse_rsync_version`.
+    """
+    import json
+
+    cache_file = os.path.join(_cache_dir(), "rsync_version.json")
+    try:
+        st = os.stat(rsync_bin)
+        key = {"path": rsync_bin, "mtime": st.st_mtime_ns, "size": st.st_size}
+    except OSError:
+        key = None
+
+    if key is not None:
+        try:
+            with open(cache_file) as fh:
+                cached = json.load(fh)
+            if all(cached.get(k) == v for k, v in key.items()):
+                return cached["version"], tuple(cached["parts"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # missing, unreadable or stale cache, ask rsync itself
+
+    output = subprocess.check_output([rsync_bin, "--version"], text=True)
+    version_str, parts = parse_rsync_version(output)
+
+    if key is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "w") as fh:
+                json.dump({**key, "version": version_str, "parts": parts}, fh)
+        except OSError:
+            pass  # caching is best effort only
+    return version_str, parts
 
-    version_str = match.group(1)
-    parts = tuple(int(p) for p in version_str.split("."))
-    while len(parts) < 3:
-        parts += (0,)
-    return version_str, parts  # type: ignore[misc]
+
+_announced = False  # whether check_rsync has already printed its banner
 
 
 def check_rsync(min_version: Tuple[int, int, int] = (3, 2, 0)) -> None:
     """Check if rsync is installed and its version meets the minimum required.
 
+    The version is detected once per process; repeated calls (e.g. for batch
+    transfers) only redo the comparison and print the banner just once.
+
     Args:
         min_version: Minimum required version of rsync.
     """
-    if shutil.which("rsync") is None:
-        abort("rsync not found in $PATH.")
-
-    output = subprocess.check_output(["rsync", "--version"], text=True)
-    version_str, version = parse_rsync_version(output)
+    global _announced
+    try:
+        version_str, version = _rsync_version(_rsync_bin())
+    except RuntimeError as e:
+        abort(str(e))
 
     if version < min_version:
         abort(f"rsync ≥ {'.'.join(map(str, min_version))} required, found {version_str}.")
 
-    colorprint(GREEN, f"✅ rsync version {version_str} detected.")
+    if not _announced:
+        colorprint(GREEN, f"✅ rsync version {version_str} detected.")
+        _announced = True
+
+
+@functools.lru_cache(maxsize=1)
+def _rsync_help() -> str:
+    """Return the `rsync --help` output (queried once per process)."""
+    return subprocess.run([_rsync_bin(), "--help"], capture_output=True, text=True).stdout
+
+
+def rsync_supports(option: str) -> bool:
+    """Check whether the installed rsync build knows the given long option.
+
+    Args:
+        option: The option name including leading dashes, e.g. `--max-map-size`.
+    """
+    return re.search(rf"(?:^|[\s,]){re.escape(option)}\b", _rsync_help(), re.MULTILINE) is not None
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helper utilities
 # ──────────────────────────────────────────────────────────────────────────────
 
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"  # used in backup and log file names
+_now = time.localtime  # clock behind the run timestamp; tests swap in a fixed one
+StrPath = Union[str, "os.PathLike[str]"]  # a path as str or e.g. pathlib.Path
+_PATH_SEP = os.sep  # for joining the internal, fully controlled paths with f-strings
+
+
 def abspath(p: str) -> str:
     """Expand `~` and make a path absolute."""
     return os.path.abspath(os.path.expanduser(p))
 
 
-def build_rsync_command(src: str, dst: str, backup_dir: str, exclude_pattern: str, dry_run: bool) -> list[str]:
+def resolved_dir(p: str, label: str = "Directory") -> str:
+    """Resolve `p` to a canonical absolute path and make sure it is a directory.
+
+    Uses a single `stat` on the resolved path, and aborts if it is missing or
+    not a directory.
+
+    Args:
+        p: Path as given on the command line.
+        label: Name used in the error message, e.g. "Source".
+
+    Returns:
+        The resolved path.
+    """
+    p = os.path.realpath(os.path.expanduser(p))
+    try:
+        is_dir = stat.S_ISDIR(os.stat(p).st_mode)
+    except OSError:
+        is_dir = False
+    if not is_dir:
+        abort(f"{label} does not exist: {p}")
+    return p
+
+
+def is_empty_dir(p: str) -> bool:
+    """Return True if the directory is missing or has no entries.
+
+    Anything else that can't be listed (a file, no permission) counts as not
+    empty, so the problem is left for rsync to report.
+    """
+    try:
+        with os.scandir(p) as it:
+            return next(it, None) is None
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+# rsync rejects block sizes above 128 KiB (_MAX_BLOCK_SIZE for protocol ≥ 30).
+_MAX_BLOCK_SIZE = 1 << 17
+
+
+def default_block_size(path: str) -> int:
+    """Derive a checksum block size from the filesystem holding `path`.
+
+    Uses 64 filesystem blocks, capped to the maximum rsync accepts. If `path`
+    does not exist yet, its closest existing parent is queried instead.
+    """
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    return min(os.statvfs(path).f_bsize * 64, _MAX_BLOCK_SIZE)
+
+
+def tuning_options(
+    dst: str,
+    block_size: Optional[int] = None,
+    preallocate: bool = False,
+    max_map_size: Optional[str] = None,
+    write_size: Optional[str] = None,
+    target_bw: Optional[float] = None,
+) -> list[str]:
+    """Translate the I/O tuning knobs into rsync options.
+
+    Args:
+        dst: Destination directory (used to derive the default block size).
+        block_size: Checksum block size in bytes; 0 picks `default_block_size(dst)`.
+        preallocate: Allocate destination files up front to reduce fragmentation.
+        max_map_size: Value for `--max-map-size` (only for rsync builds supporting it).
+        write_size: Value for `--write-size` (only for rsync builds supporting it).
+        target_bw: Throughput cap in MB/s, passed on as `--bwlimit` (in KiB/s).
+
+    Returns:
+        A list of rsync options, empty if no knob was set.
+    """
+    opts: list[str] = []
+    if block_size is not None:
+        opts.append(f"--block-size={block_size or default_block_size(dst)}")
+    if preallocate:
+        opts.append("--preallocate")
+    if target_bw is not None:
+        opts.append(f"--bwlimit={max(round(target_bw * 1_000_000 / 1024), 1)}")
+    for option, value in (("--max-map-size", max_map_size), ("--write-size", write_size)):
+        if value is None:
+            continue
+        if rsync_supports(option):
+            opts.append(f"{option}={value}")
+        else:
+            colorprint(ORANGE, f"⚠️ {option} is not supported by this rsync build, ignoring it.")
+    return opts
+
+
+# Options shared by every rsync invocation, built once.
+_BASE_OPTS = ("-ah", "--delete", "--backup")
+# Live progress, line-buffered so every update reaches the pipe at once; or just the stats.
+_INTERACTIVE_OPTS = ("--info=stats2,progress2", "--outbuf=L")
+_BATCH_OPTS = ("--info=stats2",)
+
+
+def build_rsync_command(
+    src: StrPath,
+    dst: StrPath,
+    backup_dir: StrPath,
+    exclude_pattern: str,
+    dry_run: bool,
+    whole_file: bool = False,
+    extra_opts: Sequence[str] = (),
+    log_file: Optional[str] = None,
+    interactive: bool = True,
+) -> Tuple[str, ...]:
     """Construct the full rsync command line.
 
     Args:
@@ -113,26 +337,40 @@ def build_rsync_command(src: str, dst: str, backup_dir: str, exclude_pattern: st
         backup_dir: Path for backup of deleted/replaced files.
         exclude_pattern: Files or directories to exclude.
         dry_run: Whether to perform a dry-run.
+        whole_file: Copy files whole instead of using the delta-transfer algorithm.
+        extra_opts: Additional rsync options appended after the built-in ones.
+        log_file: Let rsync log every transferred file to this path (`--log-file`).
+        interactive: Ask rsync for live progress; without it only the stats are
+            printed, which saves rsync the formatting and the pipe traffic.
 
     Returns:
-        A list of arguments for subprocess to run rsync.
+        A tuple of arguments for subprocess to run rsync.
     """
-    opts: list[str] = [
-        "-ah",
-        "--delete",
-        "--info=stats2,progress2",
+    src, dst = os.fspath(src), os.fspath(dst)
+    src_with_slash = src.rstrip(_PATH_SEP) + _PATH_SEP
+    return (
+        "rsync",
+        *(("--dry-run",) if dry_run else ()),
+        *_BASE_OPTS,
+        *(_INTERACTIVE_OPTS if interactive else _BATCH_OPTS),
         f"--exclude={exclude_pattern}",
-        "--backup",
-        f"--backup-dir={backup_dir}",
-    ]
-    if dry_run:
-        opts.insert(0, "--dry-run")
-
-    src_with_slash = src.rstrip(os.sep) + os.sep
-    return ["rsync", *opts, src_with_slash, dst]
+        f"--backup-dir={os.fspath(backup_dir)}",
+        *(("--whole-file",) if whole_file else ()),
+        *((f"--log-file={log_file}",) if log_file else ()),
+        *extra_opts,
+        src_with_slash,
+        dst,
+    )
 
 
-def print_rsync_header(dry_run: bool, exclude_pattern: str, log_file: str, cmd: str) -> None:
+def print_rsync_header(
+    dry_run: bool,
+    exclude_pattern: str,
+    log_file: str,
+    cmd: Sequence[str],
+    whole_file: bool = False,
+    jobs: int = 1,
+) -> None:
     """Print an overview of the upcoming rsync operation.
 
     Args:
@@ -140,52 +378,190 @@ def print_rsync_header(dry_run: bool, exclude_pattern: str, log_file: str, cmd:
         exclude_pattern: Pattern used for exclusions.
         log_file: Path where the log will be saved.
         cmd: The rsync command (list of args).
+        whole_file: Whether the delta-transfer algorithm is disabled.
+        jobs: Number of rsync processes run in parallel.
     """
-    colorprint(CYAN, "🚀 Running rsync…")
+    lines = [f"{CYAN}🚀 Running rsync…{RESET}"]
     if dry_run:
-        colorprint(ORANGE, "   🔍 Dry run   : True (no changes will be made)")
-    print(f"📦 Excluding:  {exclude_pattern}")
-    print(f"📝 Log file:   {log_file}")
-    print("🛠 Command:    ")
-    for arg in cmd:
-        print(f"       {arg}")
-    print("────────────────────────────────────────\n")
+        lines.append(f"{ORANGE}   🔍 Dry run   : True (no changes will be made){RESET}")
+    if whole_file:
+        # Without deltas, changed files are re-sent in full – cheap on a LAN or an
+        # empty destination, but costly over slow links (where `--checksum` style
+        # comparison plus delta transfer would send less).
+        lines.append(f"{ORANGE}   📄 Whole file: True (no delta-transfer, changed files are copied in full){RESET}")
+    if jobs > 1:
+        lines.append(f"🧵 Jobs:       up to {jobs} parallel rsync processes")
+    lines.append(f"📦 Excluding:  {exclude_pattern}")
+    lines.append(f"📝 Log file:   {log_file}")
+    lines.append("🛠 Command:    ")
+    lines.extend(f"       {arg}" for arg in cmd)
+    lines.append("────────────────────────────────────────\n\n")
+    # One write for the whole banner; the colour codes are already empty when piped.
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Core execution
 # ──────────────────────────────────────────────────────────────────────────────
 
-def execute_rsync(cmd: list[str]) -> list[str]:
+# Summary lines start with one of these; progress updates contain `%` or end in `to-chk=N/M)`.
+_STAT_PREFIXES = (b"Number of", b"Total", b"Literal", b"Matched", b"File list", b"sent", b"total size")
+_READ_SIZE = 1 << 16  # bytes per os.read() from the rsync pipe
+_PROGRESS_INTERVAL = 0.05  # seconds between two progress repaints (20 fps)
+_ERASE_EOL = b"\x1b[K"  # ANSI: clear from the cursor to the end of the line
+
+
+def _split_lines(buf: bytearray, chunk: bytes) -> list[bytes]:
+    """Append `chunk` to `buf` and pop every complete line from it.
+
+    Lines may end in a newline or a carriage return; an unterminated tail
+    stays in `buf` for the next call.
+
+    Args:
+        buf: Accumulator for the not yet terminated output.
+        chunk: Raw bytes just read from the pipe.
+
+    Returns:
+        The complete lines, without their terminators.
+    """
+    buf += chunk
+    end = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+    if end < 0:
+        return []
+    lines = bytes(buf[:end]).replace(b"\r", b"\n").split(b"\n")
+    del buf[: end + 1]
+    return lines
+
+
+def _drain(fd: int, stats: list[str], on_progress: Callable[[bytes], None]) -> None:
+    """Read rsync's output until EOF, collecting summary lines and progress updates.
+
+    Args:
+        fd: File descriptor of rsync's combined stdout/stderr pipe.
+        stats: List the summary lines are appended to.
+        on_progress: Called with every progress update.
+    """
+    buf = bytearray()
+    while True:
+        chunk = os.read(fd, _READ_SIZE)
+        # At EOF a trailing newline flushes the last, unterminated line. The lines
+        # come without terminators, so they are used as they are; no rstrip() copy.
+        for line in _split_lines(buf, chunk or b"\n"):
+            if not line:
+                continue
+
+            if line.startswith(_STAT_PREFIXES):
+                stats.append(line.decode(errors="replace"))
+            # Every progress2 update has a `%`; only the rare end-of-transfer marker may
+            # lack it, and that one always ends in "(…, to-chk=N/M)".
+            elif b"%" in line or (line.endswith(b")") and b"to-chk=" in line):
+                on_progress(line)
+        if not chunk:
+            return
+
+
+def _execute_to_file(cmd: Sequence[str], pass_fds: Sequence[int]) -> list[str]:
+    """Run rsync with its stdout going straight to a temporary file, then pick out the summary.
+
+    Nothing is read while rsync runs; its stderr is inherited so errors still
+    reach the user.
+
+    Args:
+        cmd: The full rsync command as a sequence of strings.
+        pass_fds: File descriptors to keep open in rsync.
+
+    Returns:
+        A list of strings containing rsync summary lines.
+    """
+    import tempfile
+
+    with tempfile.TemporaryFile() as out_file:
+        with subprocess.Popen(cmd, stdout=out_file, pass_fds=pass_fds) as proc:
+            try:
+                proc.wait()
+            except KeyboardInterrupt:
+                proc.terminate()
+                abort("Interrupted by user.")
+
+        if proc.returncode != 0:
+            abort(f"rsync exited with code {proc.returncode}.", proc.returncode)
+
+        out_file.seek(0)
+        output = out_file.read()
+
+    return [
+        line.rstrip().decode(errors="replace")
+        for line in output.replace(b"\r", b"\n").split(b"\n")
+        if line.startswith(_STAT_PREFIXES)
+    ]
+
+
+def execute_rsync(cmd: Sequence[str], progress: bool = True, pass_fds: Sequence[int] = ()) -> list[str]:
     """Execute the rsync process and collect its summary statistics.
 
+    When progress is wanted and stdout is a terminal, a background thread
+    drains rsync's output pipe so a slow terminal never stalls rsync, and
+    hands only the latest progress update to the main thread, which repaints
+    at most every `_PROGRESS_INTERVAL` seconds. The output is read in large
+    raw chunks and split on both carriage returns and newlines (rsync
+    terminates progress updates with a carriage return). Otherwise the live
+    progress is useless, so rsync writes to a file that is parsed once at the
+    end.
+
     Args:
-        cmd: The full rsync command as a list of strings.
+        cmd: The full rsync command as a sequence of strings.
+        progress: Whether to render rsync's live progress line.
+        pass_fds: File descriptors to keep open in rsync, e.g. for `--files-from`.
 
     Returns:
         A list of strings containing rsync summary lines.
     """
+    if not (progress and sys.stdout.isatty()):
+        return _execute_to_file(cmd, pass_fds)
+
     stats: list[str] = []
-    prev_len = 0
+    slot: queue.Queue[bytes] = queue.Queue(maxsize=1)  # latest progress update not yet painted
+    out = sys.stdout.buffer
+    sys.stdout.flush()  # keep already printed text ahead of the raw progress bytes
 
-    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as proc:
+    def offer(line: bytes) -> None:
+        # Replace a stale update so the main thread always paints the newest one.
         try:
-            for line in proc.stdout:  # type: ignore[union-attr]
-                line = line.rstrip()
-                if not line:
-                    continue
-
-                if re.match(r"^(Number of|Total|Literal|Matched|File list|sent|total size)", line):
-                    stats.append(line)
-                elif "%" in line or "to-chk=" in line:
-                    padding = " " * max(prev_len - len(line), 0)
-                    print(f"\r{line}{padding}", end="", flush=True)
-                    prev_len = len(line)
+            slot.put_nowait(line)
+        except queue.Full:
+            with contextlib.suppress(queue.Empty):
+                slot.get_nowait()
+            with contextlib.suppress(queue.Full):
+                slot.put_nowait(line)
+
+    def paint(line: bytes) -> None:
+        out.write(b"\r" + line + _ERASE_EOL)
+        out.flush()
+
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0, pass_fds=pass_fds
+    ) as proc:
+        fd = proc.stdout.fileno()  # type: ignore[union-attr]
+        reader = threading.Thread(target=_drain, args=(fd, stats, offer), daemon=True)
+        try:
+            reader.start()
+            while True:
+                alive = reader.is_alive()
+                try:
+                    line = slot.get(timeout=_PROGRESS_INTERVAL) if alive else slot.get_nowait()
+                except queue.Empty:
+                    if alive:
+                        continue
+                    break
+                paint(line)
+                reader.join(_PROGRESS_INTERVAL)  # throttle repaints, but return early at EOF
+            print()
         except KeyboardInterrupt:
             proc.terminate()
+            reader.join(timeout=1)
             abort("Interrupted by user.")
 
-        print()
         proc.wait()
 
         if proc.returncode != 0:
@@ -194,8 +570,325 @@ def execute_rsync(cmd: list[str]) -> list[str]:
     return stats
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Parallel transfer
+# ──────────────────────────────────────────────────────────────────────────────
+
+_NUM_RE = re.compile(r"(\d+(?:,\d{3})*(?:\.\d+)?)([KMGTP]?)")
+_HUMAN_UNITS = "KMGTP"
+# "Number of files: 3 (reg: 2, dir: 1)": a total followed by an optional per-type breakdown.
+_BREAKDOWN_RE = re.compile(r"(?P<head>[^:]+:\s*)(?P<total>[\d,]+)(?:\s*\((?P<parts>[^)]*)\))?")
+
+
+def _parse_number(digits: str, unit: str) -> float:
+    """Convert a number found by `_NUM_RE` (e.g. `1,234` or `1.23` + `K`) to a float."""
+    value = float(digits.replace(",", ""))
+    if unit:
+        value *= 1000 ** (_HUMAN_UNITS.index(unit) + 1)
+    return value
+
+
+def _format_number(value: float, decimals: int) -> str:
+    """Format a number the way `rsync -h` does (units of 1000 above 1000)."""
+    unit = ""
+    for suffix in _HUMAN_UNITS:
+        if value <= 1000:
+            break
+        value /= 1000
+        unit = suffix
+    if unit:
+        return f"{value:.2f}{unit}"
+    return f"{value:.{decimals}f}"
+
+
+def _merge_breakdowns(lines: list[str]) -> Optional[str]:
+    """Sum count lines like `Number of files: 3 (reg: 2, dir: 1)`, matching the breakdowns by type.
+
+    The totals are added up and the breakdown entries are summed by type, in
+    the order the types first appear, so runs that saw different file types
+    still add up. Returns None if a line has another shape.
+    """
+    total = 0
+    parts: dict[str, int] = {}
+    for line in lines:
+        match = _BREAKDOWN_RE.fullmatch(line)
+        if match is None:
+            return None
+        total += int(match["total"].replace(",", ""))
+        for part in filter(None, (match["parts"] or "").split(", ")):
+            key, sep, count = part.partition(":")
+            if not sep or not count.strip().replace(",", "").isdecimal():
+                return None
+            parts[key.strip()] = parts.get(key.strip(), 0) + int(count.replace(",", ""))
+
+    merged = f"{_BREAKDOWN_RE.fullmatch(lines[0])['head']}{total:,}"
+    if parts:
+        merged += " (" + ", ".join(f"{key}: {count:,}" for key, count in parts.items()) + ")"
+    return merged
+
+
+def merge_stats(shard_stats: list[list[str]]) -> list[str]:
+    """Combine the summary lines of several rsync runs into a single summary.
+
+    Lines are matched by their label (the text before the first colon, or the
+    first word) and their numbers are summed position by position. File counts
+    whose breakdowns list different types (`(reg: 2, dir: 1)` vs `(reg: 2)`)
+    are summed per type. The speedup is recomputed from the merged totals since
+    it is a ratio.
+
+    Args:
+        shard_stats: One list of summary lines per rsync run.
+
+    Returns:
+        The merged summary lines, in the order they first appeared.
+    """
+    grouped: dict[str, list[str]] = {}
+    for stats in shard_stats:
+        for line in stats:
+            label = line.split(":", 1)[0] if ":" in line else line.split(" ", 1)[0]
+            grouped.setdefault(label, []).append(line)
+
+    merged: dict[str, str] = {}
+    for label, lines in grouped.items():
+        if len(lines) == 1:
+            merged[label] = lines[0]
+            continue
+        combined = _merge_breakdowns(lines)
+        if combined is not None:
+            merged[label] = combined
+            continue
+        columns = [[_parse_number(*number) for number in _NUM_RE.findall(line)] for line in lines]
+        if any(len(values) != len(columns[0]) for values in columns):
+            colorprint(ORANGE, f"⚠️ Could not merge the differing '{label}' lines, showing the first run's.")
+            merged[label] = lines[0]
+            continue
+        totals = iter(list(map(sum, zip(*columns))))
+        merged[label] = _NUM_RE.sub(
+            lambda m: _format_number(next(totals), len(m.group(1).partition(".")[2])),
+            lines[0],
+        )
+
+    sent, total = merged.get("sent"), merged.get("total")
+    if sent is not None and total is not None and "speedup is" in total:
+        sent_bytes, received_bytes = (_parse_number(*number) for number in _NUM_RE.findall(sent)[:2])
+        total_size = _parse_number(*_NUM_RE.findall(total)[0])
+        speedup = total_size / (sent_bytes + received_bytes) if sent_bytes + received_bytes else 0.0
+        merged["total"] = f"{total.partition('speedup is')[0]}speedup is {speedup:.2f}"
+
+    return list(merged.values())
+
+
+def _tree_size(path: str) -> int:
+    """Return the total size in bytes of all files below `path` (symlinks not followed)."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def shard_entries(src: str, jobs: int, exclude_pattern: str) -> list[list[str]]:
+    """Split the top-level entries of `src` into size-balanced shards.
+
+    Uses the greedy longest-processing-time heuristic: biggest entries first,
+    each going to the currently smallest shard.
+
+    Args:
+        src: Source directory.
+        jobs: Maximum number of shards.
+        exclude_pattern: Entries matching this pattern are left out.
+
+    Returns:
+        A list of non-empty shards, each a list of entry names relative to `src`.
+    """
+    sized: list[tuple[int, str]] = []
+    with os.scandir(src) as it:
+        for entry in it:
+            if fnmatch.fnmatch(entry.name, exclude_pattern):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                size = _tree_size(entry.path)
+            else:
+                size = entry.stat(follow_symlinks=False).st_size
+            sized.append((size, entry.name))
+
+    buckets: list[tuple[int, int, list[str]]] = [(0, i, []) for i in range(max(jobs, 1))]
+    for size, name in sorted(sized, reverse=True):
+        bucket_size, i, names = heapq.heappop(buckets)
+        names.append(name)
+        heapq.heappush(buckets, (bucket_size + size, i, names))
+
+    return [names for _, _, names in sorted(buckets, key=lambda b: b[1]) if names]
+
+
+def _with_options(cmd: Sequence[str], *opts: str) -> Tuple[str, ...]:
+    """Return a copy of `cmd` with extra options inserted before the src/dst arguments."""
+    return (*cmd[:-2], *opts, *cmd[-2:])
+
+
+def _batch(cmd: Sequence[str]) -> Tuple[str, ...]:
+    """Return a copy of `cmd` that asks rsync for the stats only, for runs whose progress isn't shown."""
+    if _INTERACTIVE_OPTS[0] not in cmd:
+        return tuple(cmd)
+    return _with_options([arg for arg in cmd if arg not in _INTERACTIVE_OPTS], *_BATCH_OPTS)
+
+
+def _split_bwlimit(cmd: Sequence[str], ways: int) -> Tuple[str, ...]:
+    """Return a copy of `cmd` whose `--bwlimit` is shared by `ways` concurrent rsync processes."""
+    return tuple(
+        f"--bwlimit={max(round(int(arg.partition('=')[2]) / ways), 1)}" if arg.startswith("--bwlimit=") else arg
+        for arg in cmd
+    )
+
+
+@contextlib.contextmanager
+def _files_from(names: Sequence[str]) -> Iterator[Tuple[list[str], int]]:
+    """Feed a file list to rsync through an inherited pipe instead of a temp file.
+
+    A background thread writes `names` NUL-separated into the pipe, so rsync
+    can read the whole list at memory speed while the transfer starts.
+
+    Args:
+        names: Paths relative to the source directory.
+
+    Yields:
+        The rsync options reading the list, and the pipe's read end, which has
+        to be handed to the rsync process via `pass_fds`.
+    """
+    read_fd, write_fd = os.pipe()
+    data = b"".join(os.fsencode(name) + b"\0" for name in names)
+
+    def feed() -> None:
+        try:
+            with open(write_fd, "wb") as fh:
+                fh.write(data)
+        except BrokenPipeError:
+            pass  # rsync exited before reading the whole list
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        yield [f"--files-from=/dev/fd/{read_fd}", "--from0"], read_fd
+    finally:
+        os.close(read_fd)  # unblocks the writer if rsync stopped reading
+        writer.join()
+
+
+def execute_rsync_sharded(cmd: Sequence[str], src: str, jobs: int, exclude_pattern: str) -> list[str]:
+    """Run the transfer as several concurrent rsync processes and merge their stats.
+
+    Each shard gets its own rsync limited to a subset of the top-level entries via
+    `--files-from`. Deletions of top-level entries that no longer exist in `src`
+    are handled afterwards by a non-recursive pass over the top-level directory.
+
+    Args:
+        cmd: The full rsync command as built by `build_rsync_command`.
+        src: Source directory.
+        jobs: Number of concurrent rsync processes.
+        exclude_pattern: Pattern used for exclusions.
+
+    Returns:
+        The merged summary lines of all rsync processes.
+    """
+    shards = shard_entries(src, jobs, exclude_pattern)
+    if len(shards) < 2:
+        return execute_rsync(cmd)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    colorprint(CYAN, f"⏳ Syncing {len(shards)} shards in parallel…")
+    # The shards run at the same time, so they split a --bwlimit between them; none shows progress.
+    shard_cmd = _split_bwlimit(_batch(cmd), len(shards))
+    with contextlib.ExitStack() as stack:
+        shard_runs = []
+        for names in shards:
+            opts, list_fd = stack.enter_context(_files_from(names))
+            shard_runs.append((_with_options(shard_cmd, "--recursive", *opts), list_fd))
+
+        with ThreadPoolExecutor(max_workers=len(shard_runs)) as pool:
+            shard_stats = list(pool.map(lambda run: execute_rsync(run[0], False, (run[1],)), shard_runs))
+
+    # --files-from never deletes the listed entries' siblings, so remove stale
+    # top-level entries with a non-recursive pass (which backs them up as usual).
+    top_level = execute_rsync(_with_options(_batch(cmd), "--no-recursive", "--dirs"), progress=False)
+    deleted = [line for line in top_level if line.startswith("Number of deleted files")]
+
+    return merge_stats([*shard_stats, deleted])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Checksum verification
+# ──────────────────────────────────────────────────────────────────────────────
+
+# Only the transfer counters of a checksum pass are added to the main summary;
+# its file counts would count files that the main pass already listed.
+_TRANSFER_STATS = (
+    "Number of regular files transferred",
+    "Total transferred file size",
+    "Literal data",
+    "Matched data",
+    "Total bytes sent",
+    "Total bytes received",
+)
+
+
+def list_unchanged_files(cmd: Sequence[str]) -> list[str]:
+    """List the files that rsync's quick check (size + mtime) would skip.
+
+    Runs the command as an itemized dry-run. Files whose itemize code starts
+    with `.f` are not going to be updated; those are the only ones where a full
+    `--checksum` comparison can still find a difference.
+
+    Args:
+        cmd: The full rsync command as built by `build_rsync_command`.
+
+    Returns:
+        Paths relative to the source directory.
+    """
+    # The listing is not a transfer, so keep it out of rsync's own log.
+    cmd = tuple(arg for arg in cmd if not arg.startswith("--log-file="))
+    listing = _with_options(cmd, "--dry-run", "-ii", "-8", "--out-format=%i %n")
+    result = subprocess.run(listing, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if result.returncode != 0:
+        abort(f"rsync exited with code {result.returncode} while listing files.", result.returncode)
+
+    unchanged: list[str] = []
+    for line in result.stdout.split(b"\n"):
+        if line.startswith(b".f") and len(line) > 12:
+            unchanged.append(os.fsdecode(line[12:]))
+    return unchanged
+
+
+def execute_checksum_pass(cmd: Sequence[str], files: Sequence[str]) -> list[str]:
+    """Re-sync the given files with `--checksum` to catch same-size/same-mtime drift.
+
+    Args:
+        cmd: The full rsync command as built by `build_rsync_command`.
+        files: Paths relative to the source directory, e.g. from `list_unchanged_files`.
+
+    Returns:
+        The transfer-related summary lines of the checksum pass.
+    """
+    colorprint(CYAN, f"🔎 Verifying {len(files)} unchanged-looking files by checksum…")
+    # Only explicit files are listed, so there is nothing to delete here.
+    cmd = tuple(arg for arg in cmd if arg != "--delete")
+    with _files_from(files) as (opts, list_fd):
+        stats = execute_rsync(_with_options(cmd, "--checksum", *opts), pass_fds=(list_fd,))
+    return [line for line in stats if line.startswith(_TRANSFER_STATS)]
+
+
 def save_summary(timestamp: str, stats: list[str], path: str, duration: float) -> None:
-    """Save the rsync summary to a log file.
+    """Append the rsync summary to a log file.
+
+    The file may already hold rsync's own transfer log (see `run_rsync`).
 
     Args:
         timestamp: When the operation started.
@@ -203,12 +896,20 @@ def save_summary(timestamp: str, stats: list[str], path: str, duration: float) -
         path: File path where the summary should be saved.
         duration: Time taken for the rsync run.
     """
-    with open(path, "w") as fh:
-        fh.write(f"Rsync summary for {timestamp}\n")
-        fh.write("\n────────────────────────────────────────\n")
-        fh.write("\n".join(stats))
-        fh.write("\n────────────────────────────────────────\n")
-        fh.write(f"\nDuration: {duration:.2f} seconds\n")
+    rule = "────────────────────────────────────────"
+    body = (
+        f"Rsync summary for {timestamp}\n\n{rule}\n"
+        + "".join(f"{line}\n" for line in stats)
+        + f"{rule}\n\nDuration: {duration:.2f} seconds\n"
+    )
+    data = memoryview(body.encode())
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        # A single write(2) for a summary of a few KB; loop only in case it comes back short.
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 def print_summary(stats: list[str], duration: float) -> None:
@@ -220,17 +921,48 @@ def print_summary(stats: list[str], duration: float) -> None:
     """
     colorprint(GREEN, "\n✅ Rsync summary:")
     print("────────────────────────────────────────")
-    for line in stats:
-        colorprint(CYAN, line)
-    colorprint(CYAN, f"⏱ Duration: {duration:.2f} seconds")
+    lines = [*stats, f"⏱ Duration: {duration:.2f} seconds"]
+    # One colour span around the whole block instead of a pair of codes per line.
+    sys.stdout.write(CYAN + "\n".join(lines) + RESET + "\n")
     print("────────────────────────────────────────")
 
 
+def print_completion(src: str, dst: str, backup_dir: str, dry_run: bool) -> None:
+    """Print the closing report of a finished run.
+
+    Args:
+        src: Source directory.
+        dst: Destination directory.
+        backup_dir: Directory holding the backup and the log.
+        dry_run: Whether the run was a dry run.
+    """
+    print("────────────────────────────────────────")
+    colorprint(GREEN, "\n✅ Rsync complete.")
+    print("────────────────────────────────────────")
+    colorprint(CYAN, f"📁 Source:             {src}")
+    colorprint(CYAN, f"📂 Destination:        {dst}")
+    if dry_run:
+        colorprint(ORANGE, f"🔍 Dry run:            True (nothing has been changed)")
+    else:
+        colorprint(CYAN, f"💾 Backup incl. Log:   {backup_dir}")
+    print("────────────────────────────────────────" + RESET)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Orchestration
 # ──────────────────────────────────────────────────────────────────────────────
 
-def run_rsync(src: str, dst: str, backup_dir: str, dry_run: bool) -> None:
+def run_rsync(
+    src: StrPath,
+    dst: StrPath,
+    backup_dir: StrPath,
+    dry_run: bool,
+    whole_file: bool = False,
+    jobs: int = 1,
+    extra_opts: Sequence[str] = (),
+    checksum: bool = False,
+    timestamp: Optional[str] = None,
+) -> None:
     """Orchestrate the full rsync operation, including logs and backup.
 
     Args:
@@ -238,20 +970,50 @@ def run_rsync(src: str, dst: str, backup_dir: str, dry_run: bool) -> None:
         dst: Destination directory.
         backup_dir: Directory where backup and logs will be stored.
         dry_run: Whether to perform a dry run or a real sync.
+        whole_file: Copy files whole instead of using the delta-transfer algorithm.
+        jobs: Number of rsync processes to run in parallel.
+        extra_opts: Additional rsync options, e.g. from `tuning_options`.
+        checksum: Also compare files by checksum where size and mtime match.
+        timestamp: Run timestamp used in the log file name; defaults to the one in
+            the `backup_dir` name, or to now.
     """
+    src, dst, backup_dir = os.fspath(src), os.fspath(dst), os.fspath(backup_dir).rstrip(_PATH_SEP)
     if not dry_run:
-        os.makedirs(backup_dir, exist_ok=True)
+        # The destination usually exists already, so try the single mkdir first.
+        try:
+            os.mkdir(backup_dir, 0o755)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            os.makedirs(backup_dir, exist_ok=True)
 
     exclude_pattern = "000_rsync_backup_*"
 
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file = os.path.join(backup_dir, f"000_rsync_log_{timestamp}.log")
-
-    cmd = build_rsync_command(src, dst, backup_dir, exclude_pattern, dry_run)
-    print_rsync_header(dry_run, exclude_pattern, log_file, cmd)
+    if timestamp is None:
+        # Match the log to a backup dir named by main(), rather than reading the clock again.
+        name = backup_dir.rpartition(_PATH_SEP)[2]
+        prefix = "000_rsync_backup_"
+        timestamp = name[len(prefix):] if name.startswith(prefix) else time.strftime(TIMESTAMP_FORMAT, _now())
+    log_file = f"{backup_dir}{_PATH_SEP}000_rsync_log_{timestamp}.log"
+
+    # Without a terminal there is no point in live progress; rsync logs the transfer itself instead.
+    interactive = sys.stdout.isatty()
+    rsync_log = log_file if not dry_run and not interactive else None
+    cmd = build_rsync_command(
+        src, dst, backup_dir, exclude_pattern, dry_run, whole_file, extra_opts,
+        log_file=rsync_log, interactive=interactive,
+    )
+    print_rsync_header(dry_run, exclude_pattern, log_file, cmd, whole_file, jobs)
 
     start = time.time()
-    stats = execute_rsync(cmd)
+    # The listing has to happen before the transfer, afterwards every file looks unchanged.
+    suspects = list_unchanged_files(cmd) if checksum else []
+    if jobs > 1:
+        stats = execute_rsync_sharded(cmd, src, jobs, exclude_pattern)
+    else:
+        stats = execute_rsync(cmd)
+    if suspects:
+        stats = merge_stats([stats, execute_checksum_pass(cmd, suspects)])
     duration = time.time() - start
 
     if not dry_run:
@@ -260,10 +1022,132 @@ def run_rsync(src: str, dst: str, backup_dir: str, dry_run: bool) -> None:
     print_summary(stats, duration)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Multiple pairs
+# ──────────────────────────────────────────────────────────────────────────────
+
+def read_pairs(path: str) -> list[Tuple[str, str]]:
+    """Read `SRC DST` pairs from a file, one pair per line.
+
+    Blank lines and `#` comments are skipped; paths containing spaces can be
+    quoted as in a shell.
+
+    Args:
+        path: The pairs file.
+
+    Returns:
+        The (source, destination) pairs in file order.
+    """
+    pairs: list[Tuple[str, str]] = []
+    try:
+        with open(path, encoding="utf-8") as fh:
+            for lineno, line in enumerate(fh, 1):
+                try:
+                    fields = shlex.split(line, comments=True)
+                except ValueError as e:  # e.g. "No closing quotation"
+                    abort(f"{path}:{lineno}: {e}")
+                if not fields:
+                    continue
+                if len(fields) != 2:
+                    abort(f"{path}:{lineno}: expected 'SRC DST', got {line.strip()!r}")
+                pairs.append((fields[0], fields[1]))
+    except OSError as e:
+        abort(f"Cannot read pairs file: {e}")
+    if not pairs:
+        abort(f"No pairs found in {path}")
+    return pairs
+
+
+def sync_pair(src: str, dst: str, args: argparse.Namespace) -> None:
+    """Sync one source/destination pair with the options parsed by `main`.
+
+    Args:
+        src: Source directory as given by the user.
+        dst: Destination directory as given by the user.
+        args: The parsed command line.
+    """
+    src = resolved_dir(src, "Source")
+    dst = abspath(dst)
+    timestamp = time.strftime(TIMESTAMP_FORMAT, _now())
+    backup_dir = f"{dst.rstrip(_PATH_SEP)}{_PATH_SEP}000_rsync_backup_{timestamp}"
+
+    # Nothing to diff against in an empty destination, so skip the checksum work.
+    whole_file = args.whole_file or is_empty_dir(dst)
+
+    extra_opts = tuning_options(
+        dst, args.block_size, args.preallocate, args.max_map_size, args.write_size, args.target_bw
+    )
+    run_rsync(src, dst, backup_dir, args.dry_run, whole_file, args.jobs, extra_opts, args.checksum, timestamp)
+    print_completion(src, dst, backup_dir, args.dry_run)
+
+
+def _sync_pair_captured(src: str, dst: str, args: argparse.Namespace) -> Tuple[str, int]:
+    """Run `sync_pair` in a worker process and return its output and exit code.
+
+    The output is captured so that the reports of parallel pairs don't
+    interleave; without a terminal, rsync skips the live progress. Unexpected
+    errors are reported in the output too, so one broken pair doesn't keep the
+    reports of the others from being printed.
+    """
+    captured = io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(captured):
+        try:
+            sync_pair(src, dst, args)
+        except SystemExit as e:  # abort() inside the worker
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            colorprint(RED, f"❌ Syncing {src} to {dst} failed: {type(e).__name__}: {e}")
+            code = 1
+    return captured.getvalue(), code
+
+
+def run_many(pairs: Sequence[Tuple[str, str]], args: argparse.Namespace, workers: Optional[int] = None) -> None:
+    """Sync several pairs in parallel worker processes.
+
+    Each pair runs `sync_pair` in its own process; its report is printed in
+    one piece as soon as the pair is done.
+
+    Args:
+        pairs: The (source, destination) pairs.
+        args: The parsed command line, shared by all pairs.
+        workers: Maximum number of pairs synced at the same time;
+            defaults to the number of CPUs.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = min(workers or os.cpu_count() or 1, len(pairs))
+    if args.target_bw is not None:  # the cap is shared by all pairs running at once
+        args = argparse.Namespace(**{**vars(args), "target_bw": args.target_bw / workers})
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_sync_pair_captured, src, dst, args) for src, dst in pairs]
+        for future in as_completed(futures):
+            output, code = future.result()
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            failed += code != 0
+    if failed:
+        abort(f"{failed} of {len(pairs)} pairs failed.")
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # CLI
 # ──────────────────────────────────────────────────────────────────────────────
 
+def _block_size_arg(value: str) -> int:
+    """Parse `--block-size`: a size in bytes, or `auto` (0) for the filesystem-derived default."""
+    if value == "auto":
+        return 0
+    try:
+        size = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of bytes or 'auto', got {value!r}") from None
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {size}")
+    return size
+
+
 def main() -> None:
     """Parse CLI arguments and execute the rsync wrapper."""
     check_platform()
@@ -273,33 +1157,80 @@ def main() -> None:
         epilog="Example:\n  ./safe_rsync.py -n ~/data1 ~/data2",
         formatter_class=argparse.RawTextHelpFormatter,
     )
-    parser.add_argument("src", help="Source directory")
-    parser.add_argument("dst", help="Destination directory")
+    parser.add_argument("src", nargs="?", help="Source directory")
+    parser.add_argument("dst", nargs="?", help="Destination directory")
     parser.add_argument("-n", "--dry-run", action="store_true", help="Dry run (no changes)")
-    args = parser.parse_args()
+    parser.add_argument(
+        "-W", "--whole-file",
+        action="store_true",
+        help="Copy files whole, without rsync's delta-transfer algorithm\n"
+             "(faster on a LAN; enabled automatically for an empty destination)",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Split the top-level entries of the source across N parallel rsync processes",
+    )
+    parser.add_argument(
+        "--pairs",
+        metavar="FILE",
+        help="Sync every 'SRC DST' pair listed in FILE (one per line) instead of SRC and DST",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="With --pairs: number of pairs synced in parallel (default: number of CPUs)",
+    )
 
-    dry_run = args.dry_run
-    src = abspath(args.src)
-    dst = abspath(args.dst)
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    backup_dir = os.path.join(dst, f"000_rsync_backup_{timestamp}")
+    parser.add_argument(
+        "-c", "--checksum",
+        action="store_true",
+        help="Also compare files with equal size and mtime by checksum\n"
+             "(only those files are read in full, in a second pass)",
+    )
 
-    if not os.path.isdir(src):
-        abort(f"Source does not exist: {src}")
+    tuning = parser.add_argument_group("I/O tuning")
+    tuning.add_argument(
+        "--block-size",
+        type=_block_size_arg,
+        metavar="BYTES|auto",
+        help="Checksum block size; 'auto' uses 64 blocks of the destination filesystem",
+    )
+    tuning.add_argument("--preallocate", action="store_true", help="Preallocate destination files")
+    tuning.add_argument("--max-map-size", metavar="SIZE", help="Read buffer size, e.g. 4M (if rsync supports it)")
+    tuning.add_argument("--write-size", metavar="SIZE", help="Write buffer size, e.g. 512K (if rsync supports it)")
+    tuning.add_argument(
+        "--target-bw",
+        type=float,
+        metavar="MB/s",
+        help="Cap the total transfer rate (rsync --bwlimit),\nshared by the parallel --jobs / --workers",
+    )
+    args = parser.parse_args()
 
-    check_rsync()
-    run_rsync(src, dst, backup_dir, dry_run)
+    if args.jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {args.jobs}")
+    if args.workers is not None and args.workers < 1:
+        parser.error(f"--workers must be at least 1, got {args.workers}")
+    if args.target_bw is not None and args.target_bw <= 0:
+        parser.error(f"--target-bw must be greater than 0, got {args.target_bw}")
+
+    if args.pairs:
+        if args.src or args.dst:
+            parser.error("give either SRC and DST or --pairs, not both")
+        pairs = read_pairs(args.pairs)
+    elif args.src and args.dst:
+        pairs = [(args.src, args.dst)]
+    else:
+        parser.error("SRC and DST are required (or use --pairs)")
 
-    print("────────────────────────────────────────")
-    colorprint(GREEN, "\n✅ Rsync complete.")
-    print("────────────────────────────────────────")
-    colorprint(CYAN, f"📁 Source:             {src}")
-    colorprint(CYAN, f"📂 Destination:        {dst}")
-    if dry_run:
-        colorprint(ORANGE, f"🔍 Dry run:            True (nothing has been changed)")
+    check_rsync()
+    if len(pairs) == 1:
+        sync_pair(*pairs[0], args)
     else:
-        colorprint(CYAN, f"💾 Backup incl. Log:   {backup_dir}")
-    print("────────────────────────────────────────" + RESET)
+        run_many(pairs, args, args.workers)
 
 
 if __name__ == "__main__":
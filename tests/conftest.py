@@ -0,0 +1,88 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+def pytest_configure(config):
+    """Keep the test temp dirs in RAM (/dev/shm) when it is available.
+
+    pytest's usual numbered `pytest-of-<user>/pytest-N` layout (and its cleanup
+    of old runs) is kept; only the root moves. An explicit `--basetemp` or a
+    temp root chosen by the caller wins.
+    """
+    shm = Path("/dev/shm")
+    if not config.option.basetemp and shm.is_dir() and os.access(shm, os.W_OK):
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", str(shm))
+
+
+def pytest_collection_modifyitems(items):
+    """Keep all unit tests on one pytest-xdist worker; integration tests spread across the rest.
+
+    Only takes effect with `--dist loadgroup`. The unit tests are quick anyway,
+    and running them together keeps their global monkeypatches (`shutil.which`,
+    `platform.system`, ...) and the module-level caches in one process.
+    """
+    for item in items:
+        if item.get_closest_marker("unit"):
+            item.add_marker(pytest.mark.xdist_group("unit"))
+
+
+@pytest.fixture(scope="session")
+def script_path():
+    """Fixture that returns the absolute path to the CLI script safe_rsync.py."""
+    path = (Path(__file__).parent.parent / "src" / "safe_rsync" / "safe_rsync.py").resolve()
+    assert path.exists(), f"Script not found: {path}"
+    return path
+
+
+def _write_files(directory, files):
+    """Create small text files in `directory` with raw `os` calls, sharing one dir fd."""
+    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for name, text in files.items():
+            fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+            try:
+                os.write(fd, text.encode())
+            finally:
+                os.close(fd)
+    finally:
+        os.close(dir_fd)
+
+
+@pytest.fixture(scope="session")
+def write_files():
+    """Fixture that returns a helper `write_files(directory, {name: text, ...})` for building test trees."""
+    return _write_files
+
+
+@pytest.fixture(scope="session")
+def canonical_src(tmp_path_factory):
+    """Fixture that builds the standard source tree once per test run. Treat it as read-only."""
+    src = tmp_path_factory.mktemp("canonical") / "source"
+    (src / "subdir").mkdir(parents=True)
+    _write_files(src, {"file1.txt": "Hello world", "file2.log": "Log content"})
+    _write_files(src / "subdir", {"nested.txt": "Nested content"})
+    return src
+
+
+def _link_or_copy(src, dst):
+    """Hardlink a file into the snapshot, or copy it where hardlinks aren't possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+@pytest.fixture
+def fresh_tree(canonical_src, tmp_path):
+    """Fixture that returns (source, destination) for one test.
+
+    The source is a hardlinked snapshot of `canonical_src`. rsync only reads
+    it, so sharing the inodes is safe. The destination is an empty directory.
+    """
+    src = shutil.copytree(canonical_src, tmp_path / "source", copy_function=_link_or_copy)
+    dst = tmp_path / "destination"
+    dst.mkdir()
+    return src, dst
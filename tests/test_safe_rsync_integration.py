@@ -1,37 +1,52 @@
+import os
 import subprocess
-from datetime import datetime
-from pathlib import Path
+import sys
+import time
 
 import pytest
 import safe_rsync as rs
 
+FIXED_TS = "2024-01-01_00-00-00"
+BACKUP_NAME = f"000_rsync_backup_{FIXED_TS}"
+
+
+def only_match(paths):
+    """Return the single path yielded by a glob, stopping after the second entry."""
+    it = iter(paths)
+    first = next(it, None)
+    assert first is not None, "no match"
+    assert next(it, None) is None, "more than one match"
+    return first
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Fixture that pins the run timestamp of safe_rsync to FIXED_TS."""
+    fixed = time.strptime(FIXED_TS, rs.safe_rsync.TIMESTAMP_FORMAT)
+    monkeypatch.setattr(rs.safe_rsync, "_now", lambda: fixed)
+
 
 @pytest.fixture
-def script_path():
-    """Fixture that returns the absolute path to the CLI script safe_rsync.py."""
-    path = (Path(__file__).parent.parent / "src" / "safe_rsync" / "safe_rsync.py").resolve()
-    assert path.exists(), f"Script not found: {path}"
-    return path
+def main_invoker(monkeypatch, capsys):
+    """Fixture that runs the CLI in-process and returns what it printed to stdout."""
+
+    def invoke(*args):
+        monkeypatch.setattr(sys, "argv", ["safe_rsync.py", *map(str, args)])
+        rs.main()
+        return capsys.readouterr().out
+
+    return invoke
 
 
 @pytest.mark.integration
 class TestIntegration:
     """Integration tests for full rsync behavior using real file operations."""
 
-    def test_rsync_integration_copy(self, tmp_path):
+    def test_rsync_integration_copy(self, fresh_tree):
         """Ensure files and folders are copied correctly using run_rsync()."""
-        src = tmp_path / "source"
-        dst = tmp_path / "destination"
-        src.mkdir()
-        dst.mkdir()
-
-        (src / "file1.txt").write_text("Hello world")
-        (src / "file2.log").write_text("Log content")
-        (src / "subdir").mkdir()
-        (src / "subdir" / "nested.txt").write_text("Nested content")
+        src, dst = fresh_tree
 
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_dir = dst / f"000_rsync_backup_{timestamp}"
+        backup_dir = dst / BACKUP_NAME
 
         rs.run_rsync(str(src), str(dst), str(backup_dir), dry_run=False)
 
@@ -39,82 +54,109 @@ class TestIntegration:
         assert (dst / "file2.log").read_text() == "Log content"
         assert (dst / "subdir" / "nested.txt").read_text() == "Nested content"
 
-        logs = list(backup_dir.glob("000_rsync_log_*.log"))
-        assert len(logs) == 1
-        assert "Rsync summary for" in logs[0].read_text()
+        log = only_match(backup_dir.glob("000_rsync_log_*.log"))
+        assert "Rsync summary for" in log.read_text()
 
-    def test_rsync_integration_dry_run(self, tmp_path):
+    def test_rsync_integration_dry_run(self, fresh_tree):
         """Ensure dry-run mode does not modify destination or create logs."""
-        src = tmp_path / "source"
-        dst = tmp_path / "destination"
-        src.mkdir()
-        dst.mkdir()
-
-        (src / "demo.txt").write_text("Dry run test")
+        src, dst = fresh_tree
 
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_dir = dst / f"000_rsync_backup_{timestamp}"
+        backup_dir = dst / BACKUP_NAME
 
         rs.run_rsync(str(src), str(dst), str(backup_dir), dry_run=True)
 
-        assert not (dst / "demo.txt").exists()
+        assert not (dst / "file1.txt").exists()
         assert not backup_dir.exists()
 
-    def test_rsync_integration_delete_and_backup(self, tmp_path):
+    def test_rsync_integration_delete_and_backup(self, fresh_tree, write_files):
         """Ensure deleted files are backed up and replaced files are updated."""
-        src = tmp_path / "source"
-        dst = tmp_path / "destination"
-        src.mkdir()
-        dst.mkdir()
-
-        (src / "keep.txt").write_text("Keep this file")
-        (dst / "keep.txt").write_text("Old version")
-        (dst / "delete_me.txt").write_text("This should be deleted")
+        src, dst = fresh_tree
+        # A different size than the source's "Hello world", so rsync's quick check sees the change regardless of mtime.
+        write_files(dst, {"file1.txt": "Old version of file1", "delete_me.txt": "This should be deleted"})
 
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_dir = dst / f"000_rsync_backup_{timestamp}"
+        backup_dir = dst / BACKUP_NAME
 
         rs.run_rsync(str(src), str(dst), str(backup_dir), dry_run=False)
 
         assert not (dst / "delete_me.txt").exists()
-        assert (dst / "keep.txt").read_text() == "Keep this file"
+        assert (dst / "file1.txt").read_text() == "Hello world"
+
+        backup = only_match(backup_dir.rglob("delete_me.txt"))
+        assert backup.read_text() == "This should be deleted"
+        assert (backup_dir / "file1.txt").read_text() == "Old version of file1"
+
+        only_match(backup_dir.glob("000_rsync_log_*.log"))
+
+    def test_rsync_integration_sharded(self, fresh_tree, write_files):
+        """Ensure a sharded run (-j 2) deletes and backs up stale files at every level."""
+        src, dst = fresh_tree
+        (dst / "subdir").mkdir()
+        write_files(dst, {"stale_top.txt": "Stale top-level file"})
+        write_files(dst / "subdir", {"stale_nested.txt": "Stale nested file"})
+
+        backup_dir = dst / BACKUP_NAME
+
+        rs.run_rsync(str(src), str(dst), str(backup_dir), dry_run=False, jobs=2)
 
-        backups = list(backup_dir.rglob("delete_me.txt"))
-        assert len(backups) == 1
-        assert backups[0].read_text() == "This should be deleted"
+        assert (dst / "file1.txt").read_text() == "Hello world"
+        assert (dst / "subdir" / "nested.txt").read_text() == "Nested content"
+        assert not (dst / "stale_top.txt").exists()
+        assert not (dst / "subdir" / "stale_nested.txt").exists()
+        assert (backup_dir / "stale_top.txt").read_text() == "Stale top-level file"
+        assert (backup_dir / "subdir" / "stale_nested.txt").read_text() == "Stale nested file"
+
+        summary = (backup_dir / f"000_rsync_log_{FIXED_TS}.log").read_text()
+        assert "Number of deleted files: 2" in summary
+        assert "Number of regular files transferred: 3" in summary
+
+    def test_rsync_integration_checksum(self, fresh_tree, write_files):
+        """Ensure --checksum re-sends a file whose size and mtime match but whose content differs."""
+        src, dst = fresh_tree
+        write_files(dst, {"file1.txt": "Hello WORLD"})  # same length as the source's "Hello world"
+        mtime_ns = (src / "file1.txt").stat().st_mtime_ns
+        os.utime(dst / "file1.txt", ns=(mtime_ns, mtime_ns))
+
+        backup_dir = dst / BACKUP_NAME
+
+        rs.run_rsync(str(src), str(dst), str(backup_dir), dry_run=False, checksum=True)
 
-        logs = list(backup_dir.glob("000_rsync_log_*.log"))
-        assert len(logs) == 1
+        assert (dst / "file1.txt").read_text() == "Hello world"
+        assert (backup_dir / "file1.txt").read_text() == "Hello WORLD"
 
-    def test_safe_rsync_main_copy(self, tmp_path, script_path):
+    def test_safe_rsync_main_copy(self, tmp_path, main_invoker, frozen_clock, write_files):
         """Ensure CLI call performs a real sync and generates logs."""
         src = tmp_path / "cli_src"
         dst = tmp_path / "cli_dst"
         src.mkdir()
         dst.mkdir()
-        (src / "hello.txt").write_text("From CLI test")
+        write_files(src, {"hello.txt": "From CLI test"})
 
-        result = subprocess.run(
-            ["python3", str(script_path), str(src), str(dst)],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        out = main_invoker(src, dst)
 
-        assert "✅ Rsync complete." in result.stdout
+        assert "✅ Rsync complete." in out
         assert (dst / "hello.txt").read_text() == "From CLI test"
 
-        timestamp_prefix = datetime.now().strftime("000_rsync_backup_%Y-%m-%d_")
-        backups = list(dst.glob(f"{timestamp_prefix}*/000_rsync_log_*.log"))
-        assert backups
+        assert (dst / BACKUP_NAME / f"000_rsync_log_{FIXED_TS}.log").is_file()
 
-    def test_safe_rsync_main_dry_run(self, tmp_path, script_path):
+    def test_safe_rsync_main_dry_run(self, tmp_path, main_invoker, write_files):
         """Ensure CLI dry-run mode does not modify files or create backups."""
         src = tmp_path / "cli_src"
         dst = tmp_path / "cli_dst"
         src.mkdir()
         dst.mkdir()
-        (src / "test.txt").write_text("Dry run check")
+        write_files(src, {"test.txt": "Dry run check"})
+
+        out = main_invoker("-n", src, dst)
+
+        assert "🔍 Dry run" in out
+        assert not (dst / "test.txt").exists()
+
+    def test_entrypoint_smoke(self, tmp_path, script_path):
+        """Ensure the script still runs as a standalone program."""
+        src = tmp_path / "cli_src"
+        dst = tmp_path / "cli_dst"
+        src.mkdir()
+        dst.mkdir()
 
         result = subprocess.run(
             ["python3", str(script_path), "-n", str(src), str(dst)],
@@ -123,5 +165,4 @@ class TestIntegration:
             check=True,
         )
 
-        assert "🔍 Dry run" in result.stdout
-        assert not (dst / "test.txt").exists()
+        assert "✅ Rsync complete." in result.stdout
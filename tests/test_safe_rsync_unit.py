@@ -1,13 +1,78 @@
-import re
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import MagicMock
 
 import pytest
 import safe_rsync as rs
 
 
+def stream_with(text):
+    """Return an unbuffered binary stream that yields `text` and then EOF, like rsync's stdout pipe.
+
+    It is backed by a real file descriptor because `execute_rsync` reads blocks
+    with `os.read(fileno)`, so an `io.BytesIO` will not do. It is also backed by
+    a temporary file, not an `os.pipe()`, so the test output can exceed the
+    pipe buffer without a writer thread.
+    """
+    stream = tempfile.TemporaryFile(buffering=0)
+    stream.write(text.encode())
+    stream.seek(0)
+    return stream
+
+
+def popen_stdout(text, stdout):
+    """Deliver `text` the way Popen would for its `stdout` argument: via a pipe, or written to the file."""
+    if stdout is subprocess.PIPE:
+        return stream_with(text)
+    stdout.write(text.encode())
+    return None
+
+
+def make_popen(text, returncode=0):
+    """Return a stand-in for `subprocess.Popen` whose process prints `text` and exits with `returncode`."""
+
+    def popen(*args, stdout=None, **kwargs):
+        proc = MagicMock()
+        proc.__enter__.return_value = proc
+        proc.stdout = popen_stdout(text, stdout)
+        proc.returncode = returncode
+        proc.wait.return_value = returncode
+
+        def exit(*exc_info):
+            if proc.stdout:
+                proc.stdout.close()
+            return False  # let abort()'s SystemExit through
+
+        proc.__exit__.side_effect = exit
+        return proc
+
+    return popen
+
+
 @pytest.mark.unit
 class TestUnit:
     """Unit tests for isolated components in safe_rsync.py"""
 
+    @pytest.fixture(autouse=True)
+    def isolated_version_cache(self, monkeypatch, tmp_path_factory):
+        """Keep the rsync version caches from leaking between tests or into the real $HOME."""
+        home = tmp_path_factory.mktemp("home")
+        monkeypatch.setenv("HOME", str(home))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(home / ".cache"))
+        caches = (rs.safe_rsync._rsync_bin, rs.safe_rsync._rsync_version, rs.safe_rsync._rsync_help)
+        for cached in caches:
+            cached.cache_clear()
+        monkeypatch.setattr(rs.safe_rsync, "_announced", False)
+        yield
+        # Don't hand a fake rsync path, version or help text on to later tests in this process.
+        for cached in caches:
+            cached.cache_clear()
+
     def test_parse_rsync_version(self):
         """Test that rsync version output is parsed into a string and tuple."""
         out = "rsync  version  3.2.7  protocol 31\nCopyright (C) 1996-2022"
@@ -16,6 +81,13 @@ class TestUnit:
         assert ver_str == "3.2.7"
         assert ver_tuple == (3, 2, 7)
 
+        assert rs.parse_rsync_version("rsync  version v3.4.1  protocol version 32\n") == ("3.4.1", (3, 4, 1))
+        assert rs.parse_rsync_version("rsync  version 3.3.0pre1  protocol version 32\n") == ("3.3.0", (3, 3, 0))
+        openrsync = "openrsync: protocol version 29\nrsync version 2.6.9 compatible\n"
+        assert rs.parse_rsync_version(openrsync) == ("2.6.9", (2, 6, 9))
+        with pytest.raises(RuntimeError):
+            rs.parse_rsync_version("openrsync: protocol version 29\n")
+
     def test_build_rsync_command_basics(self, tmp_path):
         """Test that build_rsync_command returns correct flags and structure."""
         src = tmp_path / "src"
@@ -33,12 +105,83 @@ class TestUnit:
             dry_run=True,
         )
 
-        assert cmd[:2] == ["rsync", "--dry-run"]
+        assert cmd[:2] == ("rsync", "--dry-run")
 
-        joined = " ".join(cmd)
+        tokens = set(cmd)
         for flag in ("-ah", "--delete", "--backup", "--info=stats2,progress2"):
-            pattern = rf"(?:^|\s){re.escape(flag)}(?:\s|$)"
-            assert re.search(pattern, joined)
+            assert flag in tokens
+
+    def test_build_rsync_command_whole_file(self, tmp_path):
+        """Test that --whole-file is only added when requested."""
+        args = (str(tmp_path / "src"), str(tmp_path / "dst"), str(tmp_path / "backup"), "000_rsync_backup_*", False)
+
+        assert "--whole-file" not in rs.build_rsync_command(*args)
+        assert "--whole-file" in rs.build_rsync_command(*args, whole_file=True)
+
+    def test_build_rsync_command_log_file(self, tmp_path):
+        """Test that rsync is only asked to write its own log when a log file is given."""
+        args = (str(tmp_path / "src"), str(tmp_path / "dst"), str(tmp_path / "backup"), "000_rsync_backup_*", False)
+
+        assert not any(arg.startswith("--log-file") for arg in rs.build_rsync_command(*args))
+        assert "--log-file=/tmp/x.log" in rs.build_rsync_command(*args, log_file="/tmp/x.log")
+
+    def test_build_rsync_command_batch_drops_progress(self, tmp_path):
+        """Test that non-interactive runs only ask rsync for the stats."""
+        args = (str(tmp_path / "src"), str(tmp_path / "dst"), str(tmp_path / "backup"), "000_rsync_backup_*", False)
+
+        assert "--outbuf=L" in rs.build_rsync_command(*args)
+        batch = rs.build_rsync_command(*args, interactive=False)
+        assert "--info=stats2" in batch
+        assert not any("progress2" in arg or arg.startswith("--outbuf") for arg in batch)
+
+    def test_build_rsync_command_accepts_path_objects(self, tmp_path):
+        """Test that pathlib paths give the same command line as their string form."""
+        args = (tmp_path / "src", tmp_path / "dst", tmp_path / "backup", "000_rsync_backup_*", False)
+
+        assert rs.build_rsync_command(*args) == rs.build_rsync_command(*map(str, args[:3]), *args[3:])
+
+    def test_is_empty_dir(self, tmp_path):
+        """Test that missing and empty directories count as empty, populated ones and files not."""
+        assert rs.is_empty_dir(str(tmp_path / "missing"))
+        assert rs.is_empty_dir(str(tmp_path))
+
+        (tmp_path / "file.txt").write_text("content")
+        assert not rs.is_empty_dir(str(tmp_path))
+        assert not rs.is_empty_dir(str(tmp_path / "file.txt"))  # a file as DST is left for rsync to reject
+
+    def test_resolved_dir(self, tmp_path):
+        """Test that symlinks are resolved and non-directories abort."""
+        (tmp_path / "real").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        (tmp_path / "file.txt").write_text("content")
+
+        assert rs.resolved_dir(str(tmp_path / "link")) == os.path.realpath(tmp_path / "real")
+        for bad in ("missing", "file.txt"):
+            with pytest.raises(SystemExit):
+                rs.resolved_dir(str(tmp_path / bad), "Source")
+
+    def test_tuning_options(self, monkeypatch, tmp_path):
+        """Test that tuning knobs map to rsync options and unsupported ones are dropped."""
+        monkeypatch.setattr(rs.safe_rsync, "_rsync_help", lambda: "     --write-size=SIZE       write buffer size\n")
+
+        opts = rs.tuning_options(str(tmp_path), block_size=0, preallocate=True, max_map_size="4M", write_size="512K")
+
+        assert opts == [
+            f"--block-size={rs.default_block_size(str(tmp_path))}",
+            "--preallocate",
+            "--write-size=512K",
+        ]
+        assert rs.tuning_options(str(tmp_path), target_bw=10) == ["--bwlimit=9766"]
+        assert rs.default_block_size(str(tmp_path / "missing" / "dir")) <= 128 * 1024
+        assert rs.tuning_options(str(tmp_path)) == []
+
+    def test_block_size_arg(self):
+        """Test that --block-size takes a byte count or 'auto' and rejects anything else."""
+        assert rs.safe_rsync._block_size_arg("auto") == 0
+        assert rs.safe_rsync._block_size_arg("131072") == 131072
+        for bad in ("SRC", "0"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                rs.safe_rsync._block_size_arg(bad)
 
     def test_check_platform(self, monkeypatch):
         """Test that Windows platform raises an error, while Linux/macOS passes."""
@@ -49,38 +192,51 @@ class TestUnit:
         with pytest.raises(SystemExit):
             rs.check_platform()
 
-    def test_check_rsync_good_version(self, monkeypatch):
-        """Test that a valid rsync version passes the check."""
-        monkeypatch.setattr("shutil.which", lambda cmd: "/usr/bin/rsync")
-
-        fake_output = "rsync  version  3.2.7  protocol 31\n"
-        monkeypatch.setattr(
-            "subprocess.check_output",
-            lambda cmd, text: fake_output,
-        )
+    @pytest.mark.parametrize(
+        "which, out, raises",
+        [
+            ("/usr/bin/rsync", "rsync  version  3.2.7  protocol 31\n", False),
+            ("/usr/bin/rsync", "rsync  version  3.1.0  protocol 30\n", True),
+            ("/usr/bin/rsync", "openrsync: protocol version 29\nrsync version 2.6.9 compatible\n", True),
+            ("/usr/bin/rsync", "something else\n", True),
+            (None, None, True),
+        ],
+        ids=["good-version", "too-old", "openrsync", "unparsable", "missing"],
+    )
+    def test_check_rsync(self, monkeypatch, capsys, which, out, raises):
+        """Test that a valid rsync passes (announcing itself once), while an outdated or missing one exits."""
+        monkeypatch.setattr("shutil.which", lambda cmd: which)
+        if out is not None:
+            monkeypatch.setattr("subprocess.check_output", lambda cmd, text: out)
+
+        with pytest.raises(SystemExit) if raises else contextlib.nullcontext():
+            rs.check_rsync()
+            rs.check_rsync()
+            assert capsys.readouterr().out.count("rsync version 3.2.7 detected") == 1
 
-        # Should print a green success message and not raise
-        rs.check_rsync()
+    def test_check_rsync_uses_disk_cache(self, monkeypatch, tmp_path):
+        """Test that the version banner is cached on disk and reused while the binary is unchanged."""
+        rsync_bin = tmp_path / "rsync"
+        rsync_bin.write_text("#!/bin/sh\n")
+        monkeypatch.setattr("shutil.which", lambda cmd: str(rsync_bin))
 
-    def test_check_rsync_too_old(self, monkeypatch):
-        """Test that an outdated rsync version raises a SystemExit."""
-        monkeypatch.setattr("shutil.which", lambda cmd: "/usr/bin/rsync")
+        calls = []
 
-        old_output = "rsync  version  3.1.0  protocol 30\n"
-        monkeypatch.setattr(
-            "subprocess.check_output",
-            lambda cmd, text: old_output,
-        )
+        def fake_check_output(cmd, text):
+            calls.append(cmd)
+            return "rsync  version  3.2.7  protocol 31\n"
 
-        with pytest.raises(SystemExit):
-            rs.check_rsync()
+        monkeypatch.setattr("subprocess.check_output", fake_check_output)
 
-    def test_check_rsync_missing(self, monkeypatch):
-        """Test that missing rsync binary raises a SystemExit."""
-        monkeypatch.setattr("shutil.which", lambda cmd: None)
+        rs.check_rsync()
+        rs.safe_rsync._rsync_version.cache_clear()
+        rs.check_rsync()
+        assert len(calls) == 1
 
-        with pytest.raises(SystemExit):
-            rs.check_rsync()
+        rsync_bin.write_text("#!/bin/sh\n# upgraded\n")
+        rs.safe_rsync._rsync_version.cache_clear()
+        rs.check_rsync()
+        assert len(calls) == 2
 
     def test_execute_rsync_success(self, monkeypatch):
         """Test that execute_rsync collects expected summary lines on success."""
@@ -91,55 +247,140 @@ class TestUnit:
             "Total file size: 1234 bytes\n",
         ]
 
-        class MockPopen:
-            def __init__(self, *args, **kwargs):
-                self.stdout = iter(mock_lines)
-                self.returncode = 0
-
-            def wait(self):
-                return self.returncode
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, *args):
-                pass
-
-        monkeypatch.setattr("subprocess.Popen", lambda *a, **kw: MockPopen())
+        monkeypatch.setattr("subprocess.Popen", make_popen("".join(mock_lines)))
         stats = rs.execute_rsync(["rsync", "dummy", "args"])
         assert "Total file size: 1234 bytes" in stats
 
+        # With live progress on a terminal the output is drained from a pipe instead.
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        assert rs.execute_rsync(["rsync", "dummy", "args"]) == stats
+
+    def test_execute_rsync_reads_output_larger_than_one_block(self, monkeypatch):
+        """Test that lines spanning several os.read() blocks are reassembled."""
+        progress = "  1,000  10%  1.00MB/s  0:00:09\r" * (2 * rs.safe_rsync._READ_SIZE // 32)
+        output = f"{progress}\nNumber of files: 10\nTotal file size: 1234 bytes\n"
+
+        monkeypatch.setattr("subprocess.Popen", make_popen(output))
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        assert rs.execute_rsync(["rsync", "dummy", "args"]) == ["Number of files: 10", "Total file size: 1234 bytes"]
+
+    def test_split_lines_keeps_unterminated_tail(self):
+        """Test that complete lines are popped and a partial line is kept for later."""
+        buf = bytearray()
+        assert rs.safe_rsync._split_lines(buf, b"a\rb\nc") == [b"a", b"b"]
+        assert buf == b"c"
+        assert rs.safe_rsync._split_lines(buf, b"d") == []
+        assert rs.safe_rsync._split_lines(buf, b"\n") == [b"cd"]
+        assert buf == b""
+
+    def test_execute_rsync_splits_carriage_returns(self, monkeypatch, capsys):
+        """Test that carriage-return separated progress updates are coalesced and the last one is painted."""
+        output = "  1,000  10%  1.00MB/s  0:00:09\r  10,000 100%  1.00MB/s  0:00:00 (xfr#1, to-chk=0/1)\nsent 10 bytes"
+
+        monkeypatch.setattr("subprocess.Popen", make_popen(output))
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        stats = rs.execute_rsync(["rsync", "dummy", "args"])
+
+        assert stats == ["sent 10 bytes"]
+        assert "to-chk=0/1" in capsys.readouterr().out
+
     def test_execute_rsync_failure(self, monkeypatch):
         """Test that execute_rsync aborts on non-zero exit code."""
+        monkeypatch.setattr("subprocess.Popen", make_popen("sending incremental file list\n", returncode=23))
+        with pytest.raises(SystemExit):
+            rs.execute_rsync(["rsync", "dummy", "args"])
 
-        class MockPopen:
-            def __init__(self, *args, **kwargs):
-                self.stdout = iter(["sending incremental file list\n"])
-                self.returncode = 23
+    def test_merge_stats(self):
+        """Test that stats of parallel runs are summed per label and the speedup recomputed."""
+        shard_a = [
+            "Number of files: 10 (reg: 8, dir: 2)",
+            "Total file size: 600 bytes",
+            "sent 1.20K bytes  received 100 bytes  50.00 bytes/sec",
+            "total size is 600  speedup is 0.46",
+        ]
+        shard_b = [
+            "Number of files: 5 (reg: 4, dir: 1)",
+            "Total file size: 1.50M bytes",
+            "sent 700 bytes  received 100 bytes  25.00 bytes/sec",
+            "total size is 1.50M  speedup is 1875.00",
+        ]
 
-            def wait(self):
-                return self.returncode
+        merged = rs.merge_stats([shard_a, shard_b, ["Number of deleted files: 2"]])
 
-            def terminate(self):
-                pass
+        assert merged == [
+            "Number of files: 15 (reg: 12, dir: 3)",
+            "Total file size: 1.50M bytes",
+            "sent 1.90K bytes  received 200 bytes  75.00 bytes/sec",
+            "total size is 1.50M  speedup is 714.29",
+            "Number of deleted files: 2",
+        ]
 
-            def __enter__(self):
-                return self
+    def test_merge_stats_differing_breakdowns(self):
+        """Test that file counts are summed per type when the runs saw different kinds of files."""
+        merged = rs.merge_stats(
+            [
+                ["Number of files: 3 (reg: 2, dir: 1)", "Number of created files: 0"],
+                ["Number of files: 2 (reg: 2)", "Number of created files: 1,200 (reg: 1,199, link: 1)"],
+                ["Number of files: 1 (dir: 1)"],
+            ]
+        )
 
-            def __exit__(self, *args):
-                pass
+        assert merged == [
+            "Number of files: 6 (reg: 4, dir: 2)",
+            "Number of created files: 1,200 (reg: 1,199, link: 1)",
+        ]
 
-        monkeypatch.setattr("subprocess.Popen", lambda *a, **kw: MockPopen())
-        with pytest.raises(SystemExit):
-            rs.execute_rsync(["rsync", "dummy", "args"])
+    def test_shard_entries(self, tmp_path):
+        """Test that top-level entries are spread over shards by size, skipping excluded ones."""
+        (tmp_path / "big").mkdir()
+        (tmp_path / "big" / "data.bin").write_bytes(b"x" * 1000)
+        (tmp_path / "medium.bin").write_bytes(b"x" * 600)
+        (tmp_path / "small.bin").write_bytes(b"x" * 500)
+        (tmp_path / "000_rsync_backup_old").mkdir()
+
+        shards = rs.shard_entries(str(tmp_path), 2, "000_rsync_backup_*")
+
+        assert shards == [["big"], ["medium.bin", "small.bin"]]
+        assert rs.shard_entries(str(tmp_path), 8, "000_rsync_backup_*") == [["big"], ["medium.bin"], ["small.bin"]]
+
+    def test_files_from_pipe(self):
+        """Test that the file list is streamed NUL-separated through the pipe handed to rsync."""
+        with rs.safe_rsync._files_from(["a.txt", "dir/b.txt"]) as (opts, list_fd):
+            assert opts == [f"--files-from=/dev/fd/{list_fd}", "--from0"]
+            with open(os.dup(list_fd), "rb") as fh:
+                assert fh.read() == b"a.txt\0dir/b.txt\0"
+
+    def test_list_unchanged_files(self, monkeypatch):
+        """Test that only files skipped by the quick check are picked up from the itemized listing."""
+        listing = (
+            "sending incremental file list\n"
+            ".d          ./\n"
+            ".f          same.txt\n"
+            ".f...p..... perms only.txt\n"
+            ">f.st...... changed.txt\n"
+            ">f+++++++++ new.txt\n"
+            "Number of files: 5 (reg: 4, dir: 1)\n"
+        ).encode()
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout=listing)
+
+        monkeypatch.setattr("subprocess.run", fake_run)
+
+        assert rs.list_unchanged_files(("rsync", "-ah", "/src/", "/dst")) == ["same.txt", "perms only.txt"]
+        assert calls[0][-2:] == ("/src/", "/dst")
+        assert "--dry-run" in calls[0] and "-ii" in calls[0]
 
     def test_run_rsync_dry_run(self, monkeypatch, tmp_path):
         """Test that run_rsync executes sub-components correctly in dry-run mode."""
-        mock_cmd = ["rsync", "--dry-run"]
-        monkeypatch.setattr(rs, "build_rsync_command", lambda *a, **k: mock_cmd)
-        monkeypatch.setattr(rs, "print_rsync_header", lambda *a, **k: None)
-        monkeypatch.setattr(rs, "execute_rsync", lambda *a, **k: ["Total file size: 1234"])
-        monkeypatch.setattr(rs, "print_summary", lambda stats, duration: None)
+        module = rs.safe_rsync  # run_rsync looks its helpers up here, not in the package
+        mock_cmd = ("rsync", "--dry-run")
+        monkeypatch.setattr(module, "build_rsync_command", lambda *a, **k: mock_cmd)
+        monkeypatch.setattr(module, "print_rsync_header", lambda *a, **k: None)
+        monkeypatch.setattr(module, "execute_rsync", lambda *a, **k: ["Total file size: 1234"])
+        monkeypatch.setattr(module, "print_summary", lambda stats, duration: None)
 
         src = tmp_path / "src"
         dst = tmp_path / "dst"
@@ -149,6 +390,216 @@ class TestUnit:
 
         rs.run_rsync(str(src), str(dst), str(backup), dry_run=True)
 
+        assert not backup.exists()
+
+    def test_run_rsync_log_uses_backup_timestamp(self, monkeypatch, tmp_path):
+        """Test that without an explicit timestamp the log is named after the backup directory."""
+        module = rs.safe_rsync
+        monkeypatch.setattr(module, "build_rsync_command", lambda *a, **k: ("rsync",))
+        monkeypatch.setattr(module, "print_rsync_header", lambda *a, **k: None)
+        monkeypatch.setattr(module, "execute_rsync", lambda *a, **k: ["Total file size: 1234"])
+        monkeypatch.setattr(module, "print_summary", lambda stats, duration: None)
+        backup = tmp_path / "dst" / "000_rsync_backup_2025-01-01_12-00-00"
+
+        rs.run_rsync(tmp_path / "src", tmp_path / "dst", backup, dry_run=False)
+
+        assert os.listdir(backup) == ["000_rsync_log_2025-01-01_12-00-00.log"]
+
+    def test_read_pairs(self, tmp_path, capsys):
+        """Test that pairs files skip comments and blank lines and honour shell quoting."""
+        pairs_file = tmp_path / "pairs.txt"
+        pairs_file.write_text("# nightly\n\n~/data /mnt/backup/data\n'my photos' /mnt/backup/photos  # quoted\n")
+
+        assert rs.read_pairs(str(pairs_file)) == [
+            ("~/data", "/mnt/backup/data"),
+            ("my photos", "/mnt/backup/photos"),
+        ]
+
+        pairs_file.write_text("only-one-path\n")
+        with pytest.raises(SystemExit):
+            rs.read_pairs(str(pairs_file))
+
+        pairs_file.write_text("'unbalanced /mnt/backup\n")
+        with pytest.raises(SystemExit):
+            rs.read_pairs(str(pairs_file))
+        assert f"{pairs_file}:1: No closing quotation" in capsys.readouterr().out
+
+    def test_sync_pair_captured(self, monkeypatch):
+        """Test that a worker returns its report and the exit code of an abort."""
+
+        def fake_sync_pair(src, dst, args):
+            print(f"syncing {src} -> {dst}")
+            rs.abort("boom", 23)
+
+        monkeypatch.setattr(rs.safe_rsync, "sync_pair", fake_sync_pair)
+        stdout = sys.stdout
+        output, code = rs.safe_rsync._sync_pair_captured("a", "b", None)
+
+        assert sys.stdout is stdout
+        assert "syncing a -> b" in output and "boom" in output
+        assert code == 23
+
+    def test_sync_pair_captured_unexpected_error(self, monkeypatch):
+        """Test that a worker reports other exceptions as a failed pair instead of raising them."""
+
+        def fake_sync_pair(src, dst, args):
+            print("started")
+            raise PermissionError(13, "Permission denied", dst)
+
+        monkeypatch.setattr(rs.safe_rsync, "sync_pair", fake_sync_pair)
+        output, code = rs.safe_rsync._sync_pair_captured("a", "b", None)
+
+        assert "started" in output and "PermissionError" in output and "Permission denied" in output
+        assert code == 1
+
+    @pytest.fixture
+    def serial_pool(self, monkeypatch):
+        """Fixture that runs run_many's workers one at a time in threads, so stubs apply and captures don't overlap."""
+        import concurrent.futures
+
+        monkeypatch.setattr(
+            concurrent.futures, "ProcessPoolExecutor", lambda max_workers: concurrent.futures.ThreadPoolExecutor(1)
+        )
+
+    def test_run_many_reports_every_pair(self, monkeypatch, capsys, serial_pool):
+        """Test that failing and crashing pairs are counted while all reports are still printed."""
+
+        def fake_sync_pair(src, dst, args):
+            print(f"report {src}")
+            if src == "fail":
+                rs.abort("rsync exited with code 23.", 23)
+            if src == "crash":
+                raise PermissionError(13, "Permission denied", dst)
+
+        monkeypatch.setattr(rs.safe_rsync, "sync_pair", fake_sync_pair)
+        args = argparse.Namespace(target_bw=None)
+
+        with pytest.raises(SystemExit):
+            rs.run_many([("ok", "a"), ("fail", "b"), ("crash", "c")], args, workers=2)
+
+        out = capsys.readouterr().out
+        assert all(f"report {src}" in out for src in ("ok", "fail", "crash"))
+        assert "PermissionError" in out
+        assert "2 of 3 pairs failed." in out
+
+    def test_run_many_splits_target_bw_across_workers(self, monkeypatch, serial_pool):
+        """Test that the pairs running at the same time share --target-bw."""
+        seen = []
+        monkeypatch.setattr(rs.safe_rsync, "sync_pair", lambda src, dst, args: seen.append(args.target_bw))
+        args = argparse.Namespace(target_bw=10.0)
+
+        rs.run_many([("a", "b"), ("c", "d"), ("e", "f")], args, workers=2)
+
+        assert seen == [5.0, 5.0, 5.0]
+        assert args.target_bw == 10.0  # the caller's namespace is left alone
+
+    @pytest.mark.parametrize(
+        "option", [["--jobs", "0"], ["--workers", "0"], ["--target-bw", "0"], ["--target-bw", "-5"]]
+    )
+    def test_main_rejects_out_of_range_options(self, monkeypatch, capsys, option):
+        """Test that out-of-range numbers are usage errors (exit code 2) caught before rsync is checked."""
+        monkeypatch.setattr(rs.safe_rsync, "check_rsync", lambda: pytest.fail("check_rsync must not run"))
+        monkeypatch.setattr(sys, "argv", ["safe_rsync.py", *option, "src", "dst"])
+
+        with pytest.raises(SystemExit) as excinfo:
+            rs.main()
+
+        assert excinfo.value.code == 2
+        assert f"{option[0]} must be" in capsys.readouterr().err
+
+    def test_main_pairs_file(self, monkeypatch, tmp_path):
+        """Test that --pairs dispatches all pairs to run_many, and a malformed pairs file aborts before any sync."""
+        pairs_file = tmp_path / "pairs.txt"
+        pairs_file.write_text("a b\nc d\n")
+        calls = []
+        monkeypatch.setattr(rs.safe_rsync, "check_rsync", lambda: None)
+        monkeypatch.setattr(rs.safe_rsync, "run_many", lambda pairs, args, workers: calls.append((pairs, workers)))
+
+        monkeypatch.setattr(sys, "argv", ["safe_rsync.py", "--pairs", str(pairs_file), "--workers", "3"])
+        rs.main()
+        assert calls == [([("a", "b"), ("c", "d")], 3)]
+
+        pairs_file.write_text("a b\n'c d\n")
+        with pytest.raises(SystemExit):
+            rs.main()
+        assert len(calls) == 1
+
+    def test_execute_rsync_sharded_splits_bwlimit(self, monkeypatch, tmp_path):
+        """Test that the shards share --bwlimit, while a single rsync or the top-level pass get it whole.
+
+        Runs whose progress is not shown also drop the progress options.
+        """
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "only.txt").write_text("x")
+        cmd = rs.build_rsync_command(
+            str(src), str(tmp_path / "dst"), "backup", "x", False, extra_opts=["--bwlimit=9766"]
+        )
+        limits = []
+
+        def fake_execute_rsync(cmd, progress=True, pass_fds=()):
+            limits.extend(arg for arg in cmd if arg.startswith("--bwlimit="))
+            if not progress:  # shards and the top-level pass don't ask rsync for progress they'd discard
+                assert "--info=stats2" in cmd and "--outbuf=L" not in cmd
+                assert not any("progress2" in arg for arg in cmd)
+            return []
+
+        monkeypatch.setattr(rs.safe_rsync, "execute_rsync", fake_execute_rsync)
+
+        rs.execute_rsync_sharded(cmd, str(src), 4, "x")  # one entry: no shards, one rsync
+        assert limits == ["--bwlimit=9766"]
+
+        limits.clear()
+        (src / "second.txt").write_text("y")
+        rs.execute_rsync_sharded(cmd, str(src), 4, "x")  # two shards, then the top-level pass
+        assert limits == ["--bwlimit=4883", "--bwlimit=4883", "--bwlimit=9766"]
+
+    def test_save_summary(self, tmp_path):
+        """Test that save_summary writes the header, all stats lines and the duration."""
+        log_file = tmp_path / "summary.log"
+
+        rs.save_summary("2025-01-01_12-00-00", ["Number of files: 3", "Total file size: 12 bytes"], str(log_file), 1.5)
+
+        assert log_file.read_text() == (
+            "Rsync summary for 2025-01-01_12-00-00\n"
+            "\n────────────────────────────────────────\n"
+            "Number of files: 3\n"
+            "Total file size: 12 bytes\n"
+            "────────────────────────────────────────\n"
+            "\nDuration: 1.50 seconds\n"
+        )
+
+    def test_no_colors_when_piped(self):
+        """Test that the ANSI colour codes are blanked when stdout is not a terminal."""
+        package_root = os.path.dirname(os.path.dirname(rs.__file__))
+        result = subprocess.run(
+            [sys.executable, "-c", "import safe_rsync as rs; print(repr(rs.GREEN + rs.RESET))"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": package_root},
+        )
+        assert result.stdout.strip() == "''"
+
+    def test_save_summary_many_lines(self, tmp_path):
+        """Test that a long summary is appended in full, every line in order."""
+        log_file = tmp_path / "summary.log"
+        stats = [f"line {i}" for i in range(5000)]
+
+        rs.save_summary("2025-01-01_12-00-00", stats, str(log_file), 0.1)
+
+        lines = log_file.read_text().splitlines()
+        assert lines[3:-3] == stats
+
+    def test_print_rsync_header(self, capsys):
+        """Test that the header lists the options and every command argument on its own line."""
+        rs.print_rsync_header(True, "000_rsync_backup_*", "/tmp/x.log", ("rsync", "-ah"), jobs=2)
+
+        out = capsys.readouterr().out
+        assert "Dry run   : True" in out and "up to 2 parallel" in out and "Log file:   /tmp/x.log" in out
+        assert "\n       rsync\n       -ah\n" in out
+        assert out.endswith("────────────────────────────────────────\n\n")
+
     def test_print_summary(self, capsys):
         """Test that print_summary outputs expected lines and formatting."""
         stats = [
@@ -164,3 +615,10 @@ class TestUnit:
         assert "Number of files: 3" in captured.out
         assert "Total file size: 12345 bytes" in captured.out
         assert "⏱ Duration: 2.34 seconds" in captured.out
+
+    def test_print_summary_to_text_stream(self):
+        """Test that print_summary also works when stdout is a text-only stream."""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rs.print_summary(["Number of files: 3"], 1.0)
+        assert "Number of files: 3" in out.getvalue()